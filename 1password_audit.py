@@ -1,95 +1,318 @@
 import subprocess
+import codecs
 import json
-import csv
 import sys
-import shutil
 import time
 import os
 import asyncio
-from typing import List, Dict, Any
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Dict, Any, FrozenSet, Set
 
-def check_op_installed():
-    """Checks if the 'op' CLI is installed."""
-    if not shutil.which("op"):
+# Optional HTTP backend: when OP_CONNECT_HOST and OP_CONNECT_TOKEN are set
+# (and aiohttp is available), talk to a 1Password Connect server over a
+# keep-alive session instead of spawning the op CLI for every call. Connect
+# responses match the op --format=json shapes, so parsing is unchanged.
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+@dataclass(slots=True)
+class UserAccess:
+    """Accumulated access for one user in one vault.
+
+    Slots keep each record to a single fixed-layout object instead of a
+    dict per user, which matters when the org has thousands of users
+    across hundreds of vaults.
+    """
+    name: str
+    email: str
+    permissions: int
+    access_via: Set[str]
+
+# Permissions come from a small fixed vocabulary, so each one is encoded as a
+# bit and a user's combined permissions are a single int. Unseen permission
+# names get a fresh bit on first sight, so new CLI vocabulary still works.
+_perm_bits: Dict[str, int] = {}
+_perm_strings: Dict[int, str] = {}
+
+def intern_str(value: Any) -> Any:
+    """sys.intern for strings, passthrough otherwise (op fields can be null).
+
+    The same user ids, names, and emails show up once per vault the user can
+    reach; interning collapses those repeats to one allocation and makes the
+    vault_access dict lookups compare by pointer.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+def perm_mask(permissions: List[str]) -> int:
+    """Encodes a list of permission names as a bitmask."""
+    mask = 0
+    for perm in permissions:
+        bit = _perm_bits.get(perm)
+        if bit is None:
+            bit = 1 << len(_perm_bits)
+            _perm_bits[perm] = bit
+        mask |= bit
+    return mask
+
+def perm_str(mask: int) -> str:
+    """Formats a permission bitmask as a sorted, comma-separated string (memoized)."""
+    cached = _perm_strings.get(mask)
+    if cached is None:
+        cached = ", ".join(sorted(name for name, bit in _perm_bits.items() if mask & bit))
+        _perm_strings[mask] = cached
+    return cached
+
+@lru_cache(maxsize=1024)
+def access_via_str(access_via: FrozenSet[str]) -> str:
+    """Formats an access_via set as a sorted, comma-separated string (memoized).
+
+    Most users share one of a handful of access paths (Direct, or a common
+    group or two), so the sort + join runs once per unique combination
+    rather than once per report row.
+    """
+    return ", ".join(sorted(access_via))
+
+# Cap concurrent 'op' subprocesses; unbounded fan-out thrashes fork/exec and
+# can exhaust file descriptors on orgs with hundreds of groups/vaults.
+OP_CONCURRENCY = 16
+_op_semaphore = asyncio.Semaphore(OP_CONCURRENCY)
+
+async def check_op_ready():
+    """Checks the 'op' CLI is installed and signed in with a single probe.
+
+    A missing binary raises FileNotFoundError from the exec, while an
+    installed-but-signed-out CLI exits non-zero, so one 'op whoami' call
+    distinguishes both failure modes.
+    """
+    try:
+        await run_subprocess(["op", "whoami", "--format=json"])
+    except FileNotFoundError:
         print("❌ Error: 'op' CLI is not installed or not in PATH.")
         print("   Please install the 1Password CLI: https://developer.1password.com/docs/cli/get-started/")
         sys.exit(1)
-
-def check_op_signin():
-    """Checks if the user is signed in to 'op'."""
-    try:
-        # 'op whoami' returns 0 if signed in, non-zero otherwise
-        subprocess.run(["op", "whoami"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     except subprocess.CalledProcessError:
         print("❌ Error: You are not signed in to 1Password CLI.")
         print("   Please run 'op signin' first.")
         sys.exit(1)
 
-async def run_subprocess(cmd: List[str], capture_output: bool = True, text: bool = True, check: bool = True) -> subprocess.CompletedProcess:
-    """Async wrapper for subprocess.run."""
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE if capture_output else None,
-        stderr=asyncio.subprocess.PIPE if capture_output else None
+# Extra args appended to every 'op' call; holds the session token once acquired.
+_session_args: List[str] = []
+
+# Shared aiohttp session when the Connect backend is in use, else None.
+_connect_session = None
+
+# Errors any fetcher can raise, regardless of backend.
+_FETCH_ERRORS = (subprocess.CalledProcessError, json.JSONDecodeError)
+if aiohttp:
+    _FETCH_ERRORS += (aiohttp.ClientError,)
+
+def connect_configured() -> bool:
+    """True when the Connect API backend can be used instead of the op CLI."""
+    return bool(aiohttp and os.environ.get("OP_CONNECT_HOST") and os.environ.get("OP_CONNECT_TOKEN"))
+
+async def open_connect_session():
+    """Opens the shared keep-alive session for the Connect API."""
+    global _connect_session
+    _connect_session = aiohttp.ClientSession(
+        base_url=os.environ["OP_CONNECT_HOST"],
+        headers={"Authorization": f"Bearer {os.environ['OP_CONNECT_TOKEN']}"},
+        connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
     )
-    stdout, stderr = await process.communicate()
-    return subprocess.CompletedProcess(cmd, process.returncode, stdout.decode() if text and stdout else stdout,
-                                       stderr.decode() if text and stderr else stderr)
+
+async def connect_get(path: str) -> Any:
+    """GETs a Connect API path and returns the parsed JSON body."""
+    async with _connect_session.get(path) as response:
+        response.raise_for_status()
+        return await response.json()
+
+def scim_configured() -> bool:
+    """True when a SCIM Bridge is available for bulk directory reads."""
+    return bool(aiohttp and os.environ.get("OP_SCIM_HOST") and os.environ.get("OP_SCIM_TOKEN"))
+
+async def fetch_scim_directory() -> Dict[str, List[Dict[str, Any]]]:
+    """Fetches every group's members from the SCIM Bridge in two requests.
+
+    One GET for all groups (with member refs) and one for all users, joined
+    here into an op-shaped members-by-group map. Replaces one op/Connect
+    round trip per group with a constant two.
+    """
+    async with aiohttp.ClientSession(
+        base_url=os.environ["OP_SCIM_HOST"],
+        headers={"Authorization": f"Bearer {os.environ['OP_SCIM_TOKEN']}"}
+    ) as session:
+        async with session.get("/scim/v2/Users") as response:
+            response.raise_for_status()
+            users = (await response.json()).get("Resources", [])
+        async with session.get("/scim/v2/Groups", params={"attributes": "members"}) as response:
+            response.raise_for_status()
+            groups = (await response.json()).get("Resources", [])
+
+    users_by_id = {u["id"]: u for u in users if u.get("id")}
+    members_by_group: Dict[str, List[Dict[str, Any]]] = {}
+    for group in groups:
+        group_id = group.get("id")
+        if not group_id:
+            continue
+        members = []
+        for ref in group.get("members", []):
+            user_id = ref.get("value")
+            if not user_id:
+                continue
+            user = users_by_id.get(user_id, {})
+            emails = user.get("emails") or []
+            members.append({
+                "id": user_id,
+                "name": user.get("displayName") or ref.get("display", "Unknown User"),
+                "email": emails[0].get("value", "No Email") if emails else "No Email"
+            })
+        members_by_group[group_id] = members
+    return members_by_group
+
+def acquire_op_session():
+    """Captures a session token once so each 'op' call skips re-authentication."""
+    try:
+        result = subprocess.run(["op", "signin", "--raw"], capture_output=True, text=True, check=True)
+        token = result.stdout.strip()
+        if token:
+            _session_args.extend(["--session", token])
+    except subprocess.CalledProcessError:
+        # Desktop-app integration and service accounts don't issue raw tokens;
+        # each call will authenticate on its own.
+        pass
+
+async def run_subprocess(cmd: List[str]) -> Any:
+    """Runs an op command and returns its parsed JSON output.
+
+    Raises CalledProcessError on a non-zero exit. Concurrency is bounded
+    by a semaphore. stdout is parsed as raw UTF-8 bytes in a worker
+    thread, so a large payload doesn't block the event loop from spawning
+    and reaping other subprocesses meanwhile. Only stderr is decoded, and
+    only on failure, for the error message.
+    """
+    async with _op_semaphore:
+        process = await asyncio.create_subprocess_exec(
+            *cmd, *_session_args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd, stdout,
+                                            stderr.decode() if stderr else stderr)
+    return await asyncio.to_thread(json.loads, stdout)
+
+async def stream_json_array(cmd: List[str]):
+    """Runs an op command and yields top-level JSON array items as they parse.
+
+    Unlike run_subprocess, stdout is consumed in chunks and decoded
+    incrementally with JSONDecoder.raw_decode, so items from a very large
+    listing are handed out while the subprocess is still writing and the
+    full payload never sits in memory at once.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    async with _op_semaphore:
+        process = await asyncio.create_subprocess_exec(
+            *cmd, *_session_args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        # Drain stderr concurrently; reading it only after stdout EOF can
+        # deadlock both processes once the child fills the stderr pipe.
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+        buffer = ""
+        opened = False
+        while True:
+            chunk = await process.stdout.read(65536)
+            if not chunk:
+                break
+            buffer += utf8.decode(chunk)
+            pos = 0
+            while True:
+                # Skip the separators between items (and the opening bracket)
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if not opened:
+                    if pos < len(buffer) and buffer[pos] == "[":
+                        opened = True
+                        pos += 1
+                        continue
+                    break
+                if pos >= len(buffer) or buffer[pos] == "]":
+                    break
+                try:
+                    item, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Item still incomplete; wait for the next chunk
+                    break
+                yield item
+            buffer = buffer[pos:]
+        stderr = await stderr_task
+        await process.wait()
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd, b"",
+                                            stderr.decode() if stderr else stderr)
 
 async def get_vaults() -> List[Dict[str, Any]]:
     """Fetches a list of all vaults the user can manage."""
     try:
-        result = await run_subprocess(["op", "vault", "list", "--permission", "manage_vault", "--format=json"])
-        result.check_returncode()
-        return json.loads(result.stdout)
-    except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
+        if _connect_session is not None:
+            return await connect_get("/v1/vaults")
+        return await run_subprocess(["op", "vault", "list", "--permission", "manage_vault", "--format=json"])
+    except _FETCH_ERRORS as e:
         print(f"❌ Error fetching vaults: {e}")
         sys.exit(1)
 
-async def get_all_groups() -> List[Dict[str, Any]]:
-    """Fetches a list of all groups."""
+async def get_vault_detail(vault_id: str) -> Dict[str, Any]:
+    """Fetches vault metadata, including user and group assignments, in one call."""
     try:
-        result = await run_subprocess(["op", "group", "list", "--format=json"])
-        result.check_returncode()
-        return json.loads(result.stdout)
-    except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
-        print(f"❌ Error fetching groups: {e}")
-        sys.exit(1)
-
-async def get_vault_users(vault_id: str) -> List[Dict[str, Any]]:
-    """Fetches users with access to a specific vault."""
-    try:
-        result = await run_subprocess(["op", "vault", "user", "list", vault_id, "--format=json"])
-        result.check_returncode()
-        return json.loads(result.stdout)
-    except (subprocess.CalledProcessError, json.JSONDecodeError):
-        # Some vaults might not allow listing users or might be empty/special
-        return []
-
-async def get_vault_groups(vault_id: str) -> List[Dict[str, Any]]:
-    """Fetches groups with access to a specific vault."""
-    try:
-        result = await run_subprocess(["op", "vault", "group", "list", vault_id, "--format=json"])
-        result.check_returncode()
-        return json.loads(result.stdout)
-    except (subprocess.CalledProcessError, json.JSONDecodeError):
-        return []
+        if _connect_session is not None:
+            return await connect_get(f"/v1/vaults/{vault_id}")
+        return await run_subprocess(["op", "vault", "get", vault_id, "--format=json"])
+    except _FETCH_ERRORS:
+        # Some vaults might not allow inspection or might be empty/special
+        return {}
 
 async def get_group_members(group_id: str) -> List[Dict[str, Any]]:
     """Fetches members of a specific group."""
     try:
-        result = await run_subprocess(["op", "group", "user", "list", group_id, "--format=json"])
-        result.check_returncode()
-        return json.loads(result.stdout)
-    except (subprocess.CalledProcessError, json.JSONDecodeError):
+        if _connect_session is not None:
+            return await connect_get(f"/v1/groups/{group_id}/users")
+        # Member lists are the largest payloads; stream them instead of
+        # buffering the whole response before parsing.
+        return [member async for member in
+                stream_json_array(["op", "group", "user", "list", group_id, "--format=json"])]
+    except _FETCH_ERRORS:
         return []
 
-async def fetch_group_members(group_id: str) -> tuple[str, List[Dict[str, Any]]]:
-    """Wrapper for fetching group members."""
-    members = await get_group_members(group_id)
-    return group_id, members
+async def fetch_vault_detail(vault_id: str) -> tuple[str, Dict[str, Any]]:
+    """Wrapper for fetching vault details."""
+    detail = await get_vault_detail(vault_id)
+    return vault_id, detail
+
+# Fan-out batch size: gather tasks in chunks of this many, updating the
+# progress bar once per chunk rather than once per task.
+GATHER_CHUNK = 64
 
-async def print_progress(current: int, total: int, prefix: str = "Progress", icon: str = "⚡"):
+def format_csv_rows(rows: List[tuple]) -> bytes:
+    """Formats report rows as one CSV bytes payload.
+
+    Every field is quoted with embedded quotes doubled — the only escaping
+    these fields can need — so the csv module's per-row dialect machinery is
+    skipped and each batch of rows becomes a single write. None fields (op
+    returns JSON nulls for some user fields) become empty cells, as
+    csv.DictWriter wrote them.
+    """
+    if not rows:
+        return b""
+    lines = [",".join('"%s"' % ("" if field is None else field).replace('"', '""') for field in row)
+             for row in rows]
+    return ("\n".join(lines) + "\n").encode()
+
+def print_progress(current: int, total: int, prefix: str = "Progress", icon: str = "⚡"):
     """Simple progress bar."""
     if total == 0:
         return
@@ -101,73 +324,79 @@ async def print_progress(current: int, total: int, prefix: str = "Progress", ico
     if current == total:
         print()
 
-async def process_vault(vault: Dict[str, Any], group_members_cache: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
-    """Processes a single vault, fetching direct users and group-based access."""
-    vault_name = vault.get("name", "Unknown Vault")
-    vault_id = vault.get("id")
+async def process_vault(vault: Dict[str, Any], detail: Dict[str, Any], group_members_cache: Dict[str, asyncio.Future]) -> List[tuple]:
+    """Processes a single vault's detail, combining direct users and group-based access.
 
-    if not vault_id:
-        return []
+    group_members_cache maps group id to an in-flight (or finished) member
+    fetch; awaiting an entry yields its member list.
+    """
+    vault_name = vault.get("name", "Unknown Vault")
 
-    # Dictionary to track user access for this vault
-    # Key: user_id, Value: {name, email, permissions, access_via (set)}
-    vault_access: Dict[str, Dict[str, Any]] = {}
+    # Collect every access entry first, then merge them below in one pass.
+    # Entry: (user_id, name, email, permission mask, access-via label)
+    entries: List[tuple] = []
 
     # 1. Get Direct Access
-    direct_users = await get_vault_users(vault_id)
+    direct_users = detail.get("users", [])
     for user in direct_users:
-        user_id = user.get("id")
+        user_id = intern_str(user.get("id"))
         if not user_id: continue
 
-        if user_id not in vault_access:
-            vault_access[user_id] = {
-                "name": user.get("name", "Unknown User"),
-                "email": user.get("email", "No Email"),
-                "permissions": set(user.get("permissions", [])),
-                "access_via": set(["Direct"])
-            }
-        else:
-            vault_access[user_id]["access_via"].add("Direct")
-            vault_access[user_id]["permissions"].update(user.get("permissions", []))
+        entries.append((
+            user_id,
+            intern_str(user.get("name", "Unknown User")),
+            intern_str(user.get("email", "No Email")),
+            perm_mask(user.get("permissions", [])),
+            "Direct"
+        ))
 
     # 2. Get Group Access (using cached members)
-    groups = await get_vault_groups(vault_id)
+    groups = detail.get("groups", [])
     for group in groups:
         group_name = group.get("name", "Unknown Group")
         group_id = group.get("id")
-        group_permissions = group.get("permissions", [])
+        group_via = intern_str(f"Group: {group_name}")
+        group_permissions = perm_mask(group.get("permissions", []))
 
         if not group_id: continue
 
-        group_members = group_members_cache.get(group_id, [])
+        members_future = group_members_cache.get(group_id)
+        if members_future is None: continue
+
+        group_members = await members_future
         for member in group_members:
-            user_id = member.get("id")
+            user_id = intern_str(member.get("id"))
             if not user_id: continue
 
-            if user_id not in vault_access:
-                vault_access[user_id] = {
-                    "name": member.get("name", "Unknown User"),
-                    "email": member.get("email", "No Email"),
-                    "permissions": set(group_permissions),
-                    "access_via": set([f"Group: {group_name}"])
-                }
-            else:
-                vault_access[user_id]["access_via"].add(f"Group: {group_name}")
-                vault_access[user_id]["permissions"].update(group_permissions)
+            entries.append((
+                user_id,
+                intern_str(member.get("name", "Unknown User")),
+                intern_str(member.get("email", "No Email")),
+                group_permissions,
+                group_via
+            ))
 
-    # 3. Flatten for Report
+    # Dedup the ids in first-seen order — direct users, then group members
+    # in listing order — so the report is stable between runs and diffable.
+    vault_access: Dict[str, UserAccess] = dict.fromkeys(entry[0] for entry in entries)
+    for user_id, name, email, permissions, via in entries:
+        record = vault_access[user_id]
+        if record is None:
+            vault_access[user_id] = UserAccess(name, email, permissions, {via})
+        else:
+            record.access_via.add(via)
+            record.permissions |= permissions
+
+    # 3. Flatten for Report (rows are positional, in FIELDNAMES order)
     local_report = []
     for user_data in vault_access.values():
-        permissions_str = ", ".join(sorted(list(user_data["permissions"])))
-        access_via_str = ", ".join(sorted(list(user_data["access_via"])))
-
-        local_report.append({
-            "User Name": user_data["name"],
-            "User Email": user_data["email"],
-            "Vault Name": vault_name,
-            "Permissions": permissions_str,
-            "Access Via": access_via_str
-        })
+        local_report.append((
+            user_data.name,
+            user_data.email,
+            vault_name,
+            perm_str(user_data.permissions),
+            access_via_str(frozenset(user_data.access_via))
+        ))
 
     return local_report
 
@@ -175,66 +404,100 @@ async def main():
     print("🔍 1Password Access Audit Starting...\n")
     
     print("   Stage 1: Verifying CLI setup")
-    check_op_installed()
-    check_op_signin()
-    print("      ✅ CLI ready\n")
+    if connect_configured():
+        await open_connect_session()
+        print("      ✅ Connect API ready\n")
+    else:
+        await check_op_ready()
+        acquire_op_session()
+        print("      ✅ CLI ready\n")
 
     print("   Stage 2: Fetching vaults")
     vaults = await get_vaults()
     print(f"      📂 {len(vaults)} vaults found\n")
 
-    print("   Stage 3: Fetching groups")
-    all_groups = await get_all_groups()
-    relevant_groups = [g for g in all_groups if g.get("id")]
-    total_groups = len(relevant_groups)
-    print(f"      👥 {len(all_groups)} groups total ({total_groups} relevant)\n")
+    print("   Stage 3: Fetching vault details")
+    vault_details: Dict[str, Dict[str, Any]] = {}
+    group_members_cache: Dict[str, asyncio.Future] = {}
+    total_vaults = len(vaults)
+
+    if scim_configured():
+        # Bulk-load the whole directory up front; groups the SCIM Bridge
+        # doesn't know about still fall back to per-group fetches below,
+        # and so does everything if the bridge itself is unreachable.
+        try:
+            for group_id, members in (await fetch_scim_directory()).items():
+                future = asyncio.get_running_loop().create_future()
+                future.set_result(members)
+                group_members_cache[group_id] = future
+        except _FETCH_ERRORS as e:
+            print(f"      ⚠️  SCIM Bridge unavailable ({e}); falling back to per-group fetches")
+    if total_vaults > 0:
+        tasks = [fetch_vault_detail(v["id"]) for v in vaults if v.get("id")]
+        for start in range(0, len(tasks), GATHER_CHUNK):
+            for vault_id, detail in await asyncio.gather(*tasks[start:start + GATHER_CHUNK]):
+                vault_details[vault_id] = detail
+                # Kick off member fetches as soon as a detail names a new
+                # group, overlapping them with the remaining detail fetches
+                # and with the audit itself.
+                for group in detail.get("groups", []):
+                    group_id = group.get("id")
+                    if group_id and group_id not in group_members_cache:
+                        group_members_cache[group_id] = asyncio.ensure_future(get_group_members(group_id))
+            print_progress(min(start + GATHER_CHUNK, len(tasks)), len(tasks), "Fetching", "📂")
+        print("      ✅ Vault details loaded\n")
+    else:
+        print("      ℹ️  No vaults found\n")
 
     print("   Stage 4: Loading group members")
-    group_members_cache: Dict[str, List[Dict[str, Any]]] = {}
-    if total_groups > 0:
-        tasks = [fetch_group_members(g["id"]) for g in relevant_groups]
-        completed = 0
-        for coro in asyncio.as_completed(tasks):
-            group_id, members = await coro
-            group_members_cache[group_id] = members
-            completed += 1
-            await print_progress(completed, total_groups, "Loading", "👥")
-        print("      ✅ Groups loaded\n")
+    if group_members_cache:
+        print(f"      👥 {len(group_members_cache)} group member fetches in flight\n")
     else:
         print("      ℹ️  No groups to load\n")
 
     print("   Stage 5: Auditing vault access")
-    report_data: List[Dict[str, Any]] = []
-    total_vaults = len(vaults)
-    if total_vaults > 0:
-        tasks = [process_vault(vault, group_members_cache) for vault in vaults]
-        completed = 0
-        for coro in asyncio.as_completed(tasks):
-            result = await coro
-            report_data.extend(result)
-            completed += 1
-            await print_progress(completed, total_vaults, "Auditing", "📂")
-        print("      ✅ Audit complete\n")
-    else:
-        print("      ℹ️  No vaults to audit\n")
-
-    print("   Stage 6: Generating report")
     output_file = "1password_access_report.csv"
     fieldnames = ["User Name", "User Email", "Vault Name", "Permissions", "Access Via"]
+    total_rows = 0
 
     try:
-        with open(output_file, mode="w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in report_data:
-                writer.writerow(row)
+        # Stream each vault's rows straight to disk as it completes, so peak
+        # memory stays at one vault's worth of rows rather than the whole
+        # report. Each vault's batch is pre-formatted into one bytes payload
+        # and written in a single call; the 1 MiB buffer coalesces those
+        # further into few syscalls.
+        with open(output_file, mode="wb", buffering=1 << 20) as csvfile:
+            csvfile.write(format_csv_rows([tuple(fieldnames)]))
+            if total_vaults > 0:
+                tasks = [process_vault(vault, vault_details.get(vault.get("id"), {}), group_members_cache)
+                         for vault in vaults if vault.get("id")]
+                for start in range(0, len(tasks), GATHER_CHUNK):
+                    for result in await asyncio.gather(*tasks[start:start + GATHER_CHUNK]):
+                        csvfile.write(format_csv_rows(result))
+                        total_rows += len(result)
+                    print_progress(min(start + GATHER_CHUNK, len(tasks)), len(tasks), "Auditing", "📂")
+                print("      ✅ Audit complete\n")
+            else:
+                print("      ℹ️  No vaults to audit\n")
+
+        print("   Stage 6: Finalizing report")
         full_path = os.path.abspath(output_file)
-        print(f"      📊 Report saved: {full_path} ({len(report_data)} entries)\n")
+        print(f"      📊 Report saved: {full_path} ({total_rows} entries)\n")
     except IOError as e:
         print(f"      ❌ Error writing to file {output_file}: {e}\n")
 
+    if _connect_session is not None:
+        await _connect_session.close()
+
     print("🎉 Audit finished successfully!")
     print()
 
 if __name__ == "__main__":
+    # uvloop cuts task-scheduling and subprocess-transport overhead in the
+    # fan-out stages; the default loop works fine when it isn't installed.
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file